@@ -1,4 +1,8 @@
+import io
+import csv
+
 import psycopg2
+from psycopg2.extras import execute_values
 from psycopg2.sql import Identifier, SQL
 from werkzeug.exceptions import abort
 
@@ -107,8 +111,9 @@ class PostgresQL:
                 their embeddings.
         """
 
+        # select only the used columns
         statement = """
-        SELECT * FROM document_embeddings;
+        SELECT document_id, vector FROM document_embeddings;
         """
         loaded_embeddings = self.execute(statement)
 
@@ -197,6 +202,66 @@ class PostgresQL:
         self.execute(statement, (document1_id, document2_id, sim, ))
         self.commit()
 
+    def insert_new_similarities(self, similarities, page_size=1000, copy_threshold=1000):
+        """Inserts multiple similarities into the database in a single transaction.
+
+        Large batches are streamed with COPY, smaller batches are sent as
+        multi-row INSERT statements.
+
+        Args:
+            similarities (list(tuple)): Triplets of the first document ID, the second document ID and their
+                similarity score.
+            page_size (int): The number of rows sent in a single INSERT statement. (Default = 1000)
+            copy_threshold (int): The minimum number of rows inserted with COPY. (Default = 1000)
+
+        Returns:
+            The method doesn't return anything.
+        """
+
+        if self.cursor is None:
+            raise Exception("The connection is not established")
+
+        statement = """
+            INSERT INTO similarities
+            VALUES %s;
+            """
+        try:
+            if len(similarities) >= copy_threshold:
+                self.copy_similarities(similarities)
+            else:
+                # execute_values mogrifies every row and joins them into one
+                # statement per page, which keeps the statements bounded
+                execute_values(self.cursor, statement, similarities, page_size=page_size)
+        except:
+            self.connection.rollback()
+            raise
+        self.commit()
+
+    def copy_similarities(self, similarities):
+        """Streams the similarities into the database with COPY.
+
+        The rows are serialized in the CSV format and sent in a single
+        round-trip. The transaction is not committed.
+
+        Args:
+            similarities (list(tuple)): Triplets of the first document ID, the second document ID and their
+                similarity score.
+
+        Returns:
+            The method doesn't return anything.
+        """
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for document1_id, document2_id, sim in similarities:
+            writer.writerow((document1_id, document2_id, float(sim)))
+        buffer.seek(0)
+
+        statement = """
+            COPY similarities FROM STDIN WITH (FORMAT csv);
+            """
+        self.cursor.copy_expert(statement, buffer)
+
     def commit(self):
         if self.connection:
             self.connection.commit()
@@ -139,10 +139,9 @@ def update_similarities():
     # Insert similarities into the database
 
     try:
-        for i, j, sim in additional_similarities:
-            # Insert the similarity score 'sim' between document with id 'i' and document with id 'j' into
-            # 'similarities' table
-            pg.insert_new_similarity(i, j, sim)
+        # Insert the similarity scores between the new document and all other documents into
+        # 'similarities' table in batched statements
+        pg.insert_new_similarities(additional_similarities)
     except Exception as e:
         return abort(400, "Could not add the additional similarities into the table 'similarities'. " + str(e))
 
@@ -5,7 +5,6 @@
 import os
 
 from flask import Flask
-from flask_cors import CORS
 
 from .config import config, config_logging, config_db
 
@@ -31,16 +30,13 @@ def create_app(args=None):
     SERVICE_ENV = args["env"] if args else 'development'
 
     # setup the app configuration
-    if SERVICE_ENV == 'production':
-        app.config.from_object(config.ProductionConfig)
-    elif SERVICE_ENV == 'development':
-        app.config.from_object(config.DevelopmentConfig)
-    elif SERVICE_ENV == 'testing':
-        app.config.from_object(config.TestingConfig)
+    app.config.from_mapping(config.get_config(SERVICE_ENV))
 
     # setup the cors configurations
-    if app.config['CORS']['origins']:
-        CORS(app, origins=app.config['CORS']['origins'])
+    if app.config['CORS_ORIGINS']:
+        # flask_cors is only imported when it is used
+        from flask_cors import CORS
+        CORS(app, origins=sorted(app.config['CORS_ORIGINS']))
 
     # add error handlers
     from .routes import error_handlers
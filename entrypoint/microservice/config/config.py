@@ -4,42 +4,115 @@
 # one for each environment.
 
 import os
+from types import MappingProxyType
+from functools import lru_cache
 from dotenv import load_dotenv
 load_dotenv()
 
+# environment specific settings and the variables they are read from
+ENVIRONMENT_SETTINGS = {
+    'SECRET_KEY': '{prefix}_SECRET_KEY',
+    'DB_USER': '{prefix}_DATABASE_USER',
+    'DB_HOST': '{prefix}_DATABASE_HOST',
+    'DB_PORT': '{prefix}_DATABASE_PORT',
+    'DB_PASSWORD': '{prefix}_DATABASE_PASSWORD',
+    'DB_NAME': '{prefix}_DATABASE_NAME',
+}
+
+
+def _origins(value):
+    """Parses the comma separated origins into a frozenset"""
+    return frozenset(origin.strip() for origin in value.split(',')) - {''}
+
+
+# settings shared by all environments, read from the variables of the same
+# name: the function parsing the value and the default used when it is not
+# set (a callable default is computed from the settings read before it)
+COMMON_SETTINGS = {
+    # the number of threads serving the requests (waitress defaults to 4)
+    'SERVER_THREADS': (int, 4),
+    # database connection pool settings: a thread uses at most one connection
+    'DB_POOL_MAXCONN': (int, lambda settings: settings['SERVER_THREADS']),
+    # psycopg2 closes returned connections above minconn, so keep all of them by default
+    'DB_POOL_MINCONN': (int, lambda settings: settings['DB_POOL_MAXCONN']),
+    'DB_POOL_TIMEOUT': (float, 10),
+    'DB_STATEMENT_TIMEOUT': (str, '10s'),
+    'DB_IDLE_IN_TRANSACTION_TIMEOUT': (str, '30s'),
+    # pooled HTTP session settings for calling the other microservices
+    'HTTP_POOL_CONNECTIONS': (int, 32),
+    'HTTP_POOL_MAXSIZE': (int, 64),
+    'HTTP_CONNECT_TIMEOUT': (float, 1),
+    'HTTP_READ_TIMEOUT': (float, 10),
+    # the similarity update embeds the document and inserts all of its similarities
+    'HTTP_UPDATE_READ_TIMEOUT': (float, 300),
+    # caches of the similarity and text embedding service responses
+    'SIMILARITY_CACHE_SIZE': (int, 1024),
+    'SIMILARITY_CACHE_TTL': (float, 60),
+    'EMBEDDING_CACHE_SIZE': (int, 4096),
+    # the origins allowed to access the service (empty if not set)
+    'CORS_ORIGINS': (_origins, frozenset()),
+}
+
 class Config(object):
     DEBUG = False
     TESTING = False
-    CORS = {
-        'origins': os.getenv('CORS_ORIGINS').split(',') if os.getenv('CORS_ORIGINS') else None
-    }
 
 class ProductionConfig(Config):
     """Production configuration"""
     # TODO: add required secret configurations
     ENV='production'
-    SECRET_KEY=os.getenv('PROD_SECRET_KEY')
-    DB_USER = os.getenv('PROD_DATABASE_USER')
-    DB_HOST = os.getenv('PROD_DATABASE_HOST')
-    DB_PORT = os.getenv('PROD_DATABASE_PORT')
-    DB_PASSWORD = os.getenv('PROD_DATABASE_PASSWORD')
-    DB_NAME = os.getenv('PROD_DATABASE_NAME')
+    PREFIX='PROD'
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     # TODO: add required secret configurations
     ENV='development'
+    PREFIX='DEV'
     DEBUG = True
-    SECRET_KEY=os.getenv('DEV_SECRET_KEY')
-    DB_USER = os.getenv('DEV_DATABASE_USER')
-    DB_HOST = os.getenv('DEV_DATABASE_HOST')
-    DB_PORT = os.getenv('DEV_DATABASE_PORT')
-    DB_PASSWORD = os.getenv('DEV_DATABASE_PASSWORD')
-    DB_NAME = os.getenv('DEV_DATABASE_NAME')
 
 class TestingConfig(Config):
     """Testing configuration"""
     # TODO: add required secret configurations
     ENV='testing'
+    PREFIX='TEST'
     TESTING = True
-    SECRET_KEY=os.getenv('TEST_SECRET_KEY')
+
+
+CONFIGS = {
+    'production': ProductionConfig,
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+}
+
+
+@lru_cache(maxsize=None)
+def get_config(env):
+    """Builds the configuration of the given environment
+
+    The configuration is assembled once per environment and reused
+    by every subsequent call (e.g. each create_app in the tests or
+    after a reload). It is read-only since it is shared.
+
+    Args:
+        env (str): The service environment.
+
+    Returns:
+        obj: The read-only mapping of the configuration values.
+
+    """
+
+    if env not in CONFIGS:
+        raise ValueError('Unknown service environment: {}'.format(env))
+
+    cls = CONFIGS[env]
+    settings = {key: getattr(cls, key) for key in dir(cls) if key.isupper()}
+    # read the environment variables in a single pass
+    for key, variable in ENVIRONMENT_SETTINGS.items():
+        settings[key] = os.environ.get(variable.format(prefix=cls.PREFIX))
+    for key, (parse, default) in COMMON_SETTINGS.items():
+        value = os.environ.get(key)
+        if value is not None:
+            settings[key] = parse(value)
+        else:
+            settings[key] = default(settings) if callable(default) else default
+    return MappingProxyType(settings)
@@ -2,48 +2,76 @@
 # Contains methods for establishing and
 # closing connection with the database
 
+import threading
+
 from flask import current_app, g
 
-# ! modify for different database
-# import postgresql library
-from ..library.postgresql import PostgresQL
+# guards the creation of the connection pool
+__pool_lock = threading.Lock()
 
 
-def get_db():
-    """Gets or establishes the connection to the database
+def __create_db():
+    """Creates the database object with the connection pool
     Returns:
         obj: The database object.
     """
 
-    if 'db' not in g:
+    # ! modify for different database
+    # import postgresql library on first use to
+    # keep psycopg2 out of the worker start up
+    from ..library.postgresql import PostgresQL
+
+    host = current_app.config.get('DB_HOST')
+    port = current_app.config.get('DB_PORT')
+
+    # initialize db object
+    db = PostgresQL(host=host, port=port)
+
+    # get database and password for establishing the connection
+    database = current_app.config['DB_NAME']
+    user = current_app.config['DB_USER']
+    password = current_app.config['DB_PASSWORD']
 
-        host = current_app.config.get('DB_HOST')
-        port = current_app.config.get('DB_PORT')
+    # create the connection pool
+    db.connect(database, user=user, password=password,
+        minconn=current_app.config.get('DB_POOL_MINCONN'),
+        maxconn=current_app.config.get('DB_POOL_MAXCONN'),
+        timeout=current_app.config.get('DB_POOL_TIMEOUT', 10),
+        statement_timeout=current_app.config.get('DB_STATEMENT_TIMEOUT', '10s'),
+        idle_in_transaction_timeout=current_app.config.get('DB_IDLE_IN_TRANSACTION_TIMEOUT', '30s'))
+    if db.pool is None:
+        current_app.logger.error('Could not create the database connection pool: {}'.format(db.error))
+    return db
 
-        # initialize db object
-        g.db = PostgresQL(host=host, port=port)
 
-        # get database and password for establishing the connection
-        database = current_app.config['DB_NAME']
-        user = current_app.config['DB_USER']
-        password = current_app.config['DB_PASSWORD']
+def get_db():
+    """Gets or establishes the connection to the database
+    Returns:
+        obj: The database object.
+    """
 
-        # connect to the database
-        g.db.connect(database, user=user, password=password)
+    if 'db' not in g:
+        db = current_app.extensions.get('postgresql')
+        if db is None:
+            with __pool_lock:
+                db = current_app.extensions.get('postgresql')
+                if db is None:
+                    db = __create_db()
+                    # share the pool across requests only when it was established
+                    if db.pool is not None:
+                        current_app.extensions['postgresql'] = db
+        g.db = db
 
     # return the database connection
     return g.db
 
 
 def close_db(e=None):
-    """Closes the connection to the database"""
-
-    # removes the database object from the global variable
-    db = g.pop('db', None)
-    if db is not None:
-        # ! modify for different database
-        # disconnect form the database
-        db.disconnect()
+    """Releases the database object of the current context"""
+
+    # removes the database object from the global variable,
+    # the pooled connections stay open for the next requests
+    g.pop('db', None)
 
 
 def init_app(app):
@@ -0,0 +1,106 @@
+# HTTP config script
+# Contains methods for establishing and
+# closing the pooled HTTP session used to
+# call the other microservices
+
+import atexit
+import threading
+from contextlib import contextmanager
+
+from flask import current_app
+from werkzeug.exceptions import abort
+
+# guards the creation of the HTTP session
+__session_lock = threading.Lock()
+
+
+def __create_session():
+    """Creates the HTTP session with the pooled connection adapter
+    Returns:
+        obj: The requests session.
+    """
+
+    # requests is imported on first use to keep the worker start up fast
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    adapter = HTTPAdapter(
+        pool_connections=current_app.config.get('HTTP_POOL_CONNECTIONS', 32),
+        pool_maxsize=current_app.config.get('HTTP_POOL_MAXSIZE', 64),
+        # retry only failed connects: some GET routes (e.g. the similarity
+        # update) are not idempotent and must not be resent after a read error
+        max_retries=Retry(total=2, read=False, backoff_factor=0.1)
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # release the pooled connections when the process exits
+    atexit.register(session.close)
+    return session
+
+
+def get_session():
+    """Gets or creates the HTTP session shared by the requests
+    Returns:
+        obj: The requests session.
+    """
+
+    session = current_app.extensions.get('http_session')
+    if session is None:
+        with __session_lock:
+            session = current_app.extensions.get('http_session')
+            if session is None:
+                session = __create_session()
+                current_app.extensions['http_session'] = session
+
+    # return the http session
+    return session
+
+
+@contextmanager
+def gateway_timeout(url):
+    """Converts the timeouts of the requests made in the block into 504 responses
+
+    Args:
+        url (str): The requested url.
+    """
+
+    import requests
+
+    try:
+        yield
+    except requests.Timeout as error:
+        current_app.logger.error('Request to {} timed out: {}'.format(url, error))
+        abort(504, 'The request to {} timed out'.format(url))
+
+
+def get(url, params=None, read_timeout=None):
+    """Makes the GET request with the shared session and timeout
+
+    Args:
+        url (str): The requested url.
+        params (dict): The query parameters. (Default = None)
+        read_timeout (float): The read timeout in seconds. (Default = HTTP_READ_TIMEOUT)
+
+    Returns:
+        obj: The response object.
+    """
+
+    with gateway_timeout(url):
+        return get_session().get(url, params=params, timeout=get_timeout(read_timeout))
+
+
+def get_timeout(read_timeout=None):
+    """Gets the (connect, read) timeout of the requests
+
+    Args:
+        read_timeout (float): The read timeout in seconds. (Default = HTTP_READ_TIMEOUT)
+
+    Returns:
+        tuple: The connect and read timeout in seconds.
+    """
+
+    if read_timeout is None:
+        read_timeout = current_app.config.get('HTTP_READ_TIMEOUT', 10)
+    return (current_app.config.get('HTTP_CONNECT_TIMEOUT', 1), read_timeout)
@@ -0,0 +1,99 @@
+# Cache functions
+# The thread safe caches of the responses
+# received from the other microservices
+
+import hashlib
+import threading
+
+from cachetools import LRUCache, TTLCache
+from flask import current_app
+
+# guards the creation of the per application caches
+__caches_lock = threading.Lock()
+
+
+class Cache:
+    """Thread safe cache of the parsed service responses
+
+    Args:
+        maxsize (int): The maximum number of cached responses.
+        ttl (float): Seconds a response stays cached. If None the
+            least recently used responses are evicted. (Default None)
+
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.__cache = LRUCache(maxsize=maxsize) if ttl is None else TTLCache(maxsize=maxsize, ttl=ttl)
+        self.__lock = threading.Lock()
+
+
+    def get(self, key):
+        """Gets the cached response
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            obj: The cached response or None if it is not cached.
+
+        """
+        with self.__lock:
+            return self.__cache.get(key)
+
+
+    def set(self, key, value):
+        """Caches the response
+
+        Args:
+            key (tuple): The cache key.
+            value (obj): The response to cache.
+
+        """
+        with self.__lock:
+            self.__cache[key] = value
+
+
+    def clear(self):
+        """Removes all of the cached responses"""
+        with self.__lock:
+            self.__cache.clear()
+
+
+def get_cache(name, maxsize, ttl=None):
+    """Gets or creates the named cache of the application
+
+    Args:
+        name (str): The name of the cache.
+        maxsize (int): The maximum number of cached responses.
+        ttl (float): Seconds a response stays cached. (Default None)
+
+    Returns:
+        obj: The cache.
+
+    """
+    caches = current_app.extensions.setdefault('caches', {})
+    cache = caches.get(name)
+    if cache is None:
+        with __caches_lock:
+            cache = caches.get(name)
+            if cache is None:
+                cache = Cache(maxsize, ttl=ttl)
+                caches[name] = cache
+
+    # return the cache
+    return cache
+
+
+def text_key(text, language):
+    """Creates the cache key of the text
+
+    Args:
+        text (str): The text.
+        language (str): The language of the text.
+
+    Returns:
+        tuple: the digest of the text and its language.
+
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    return (digest, language)
@@ -1,6 +1,11 @@
 # Formatter functions
 # The functions used to format different objects
 
+from decimal import Decimal
+
+import orjson
+from flask import current_app
+
 
 def format_document(document):
     """Formats the given document
@@ -17,3 +22,49 @@ def format_document(document):
     return None
 
 
+def __json_default(obj):
+    """Serializes the objects not natively supported by orjson
+
+    Args:
+        obj (obj): The object to serialize.
+
+    Returns:
+        obj: the serializable representation of the object.
+
+    """
+
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+
+def dumps(data):
+    """Serializes the data to JSON with orjson
+
+    Dates are formatted as ISO 8601 strings and naive
+    datetimes are treated as UTC.
+
+    Args:
+        data (obj): The JSON serializable data.
+
+    Returns:
+        bytes: the serialized JSON.
+
+    """
+
+    return orjson.dumps(data, default=__json_default, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+
+def ojsonify(data, status=200):
+    """Creates the JSON response of the data with orjson
+
+    Args:
+        data (obj): The JSON serializable data.
+        status (int): The response status code. (Default = 200)
+
+    Returns:
+        obj: the flask response object.
+
+    """
+
+    return current_app.response_class(dumps(data), status=status, mimetype='application/json')
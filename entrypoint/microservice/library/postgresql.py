@@ -1,8 +1,57 @@
+import threading
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2.extensions import connection as Connection
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+
+# the document metadata returned to the user, i.e. every column of the
+# documents table except `fulltext` (see the response example in
+# templates/index.html); `fulltext_cleaned` is sliced down to 500 chars,
+# so the large text values are not transferred from the database
+DOCUMENT_COLUMNS = (
+    "document_id", "abstract", "basin", "category", "celex_num", "classification",
+    "courtname", "date", "depository", "document_source", "documenttype",
+    "entryintoforce", "entryintoforcenotes", "fieldofapplication", "form",
+    "LEFT(fulltext_cleaned, 500) AS fulltext_cleaned", "fulltextlink", "isbn", "issn",
+    "journalseries", "meetinglink", "meetingname", "name", "pages", "placeofadoption",
+    "placepublication", "publisher", "referencenumber", "seatofcourt", "sourceid",
+    "sourcelink", "sourcename", "status", "title", "treatylink", "treatyname",
+    "typeofcourt", "website", "websitelink",
+)
+
+# the metadata of the requested documents
+SELECT_DOCUMENTS = (
+    "SELECT " + ", ".join(DOCUMENT_COLUMNS) + " "
+    "FROM documents WHERE document_id = ANY({ids}) "
+    "AND ({after_id}::int IS NULL OR document_id > {after_id}) "
+    "ORDER BY CASE WHEN {order_by_ids} THEN array_position({ids}, document_id) END, document_id "
+    "LIMIT {limit}"
+)
+
+# the statements prepared on a pooled connection the first time they are executed on it
+PREPARED_STATEMENTS = {
+    'get_documents': (
+        "PREPARE get_documents (int[], int, boolean, int) AS " +
+        SELECT_DOCUMENTS.format(ids='$1', after_id='$2', order_by_ids='$3', limit='$4')
+    ),
+}
+
+EXECUTE_DOCUMENTS = "EXECUTE get_documents (%(ids)s, %(after_id)s, %(order_by_ids)s, %(limit)s);"
+
+
+class PreparedConnection(Connection):
+    """Connection remembering the statements prepared in its session"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
 
 
 class PostgresQL:
-    """Connection to the PostgresQL database
+    """Connection pool to the PostgresQL database
 
     Args:
         host (str): The host address. (Default "127.0.0.1")
@@ -13,94 +62,186 @@ class PostgresQL:
     def __init__(self, host="127.0.0.1", port="5432"):
         self.host = host
         self.port = port
+        self.pool = None
+        self.error = None
 
 
-    def connect(self, database, password, user="postgres"):
-        """Connects to the database with the provided user and password
+    def connect(self, database, password, user="postgres", minconn=None, maxconn=4, timeout=10,
+                statement_timeout='10s', idle_in_transaction_timeout='30s'):
+        """Creates the connection pool with the provided user and password
 
         Args:
             database (str): The database name.
             password (str): The password of the user.
             user (str): The postgresql user. (Default "postgres")
+            minconn (int): The number of connections opened upfront and the maximum number of idle
+                connections kept open; connections returned above it are closed. (Default maxconn)
+            maxconn (int): The maximum number of pooled connections. (Default 4)
+            timeout (float): Seconds to wait for a free connection. (Default 10)
+            statement_timeout (str): The maximum duration of a statement. (Default "10s")
+            idle_in_transaction_timeout (str): The maximum idle duration of an open transaction. (Default "30s")
         """
 
+        if minconn is None:
+            minconn = maxconn
+
         try:
-            # create a connection
-            self.connection = psycopg2.connect(
+            # create the connection pool
+            self.pool = ThreadedConnectionPool(
+                minconn,
+                maxconn,
                 user = user,
                 password = password,
                 host = self.host,
                 port = self.port,
-                database = database
+                database = database,
+                connection_factory = PreparedConnection,
+                # bound the statements and open transactions of every session
+                options = '-c statement_timeout={} -c idle_in_transaction_session_timeout={}'.format(
+                    statement_timeout, idle_in_transaction_timeout)
             )
 
-            # store the connection cursor
-            self.cursor = self.connection.cursor()
+            # limits the number of concurrent checkouts to the pool size
+            self.__slots = threading.BoundedSemaphore(maxconn)
+            self.__timeout = timeout
 
         except (Exception, psycopg2.Error) as error:
-            # notify the user about the error
-            self.cursor = None
+            # keep the error to notify the user about it
+            self.pool = None
+            self.error = error
 
 
     def disconnect(self):
-        """Disconnect the postgresql connection to the database"""
-        if self.connection:
-            self.cursor.close()
-            self.connection.close()
+        """Closes all of the pooled connections to the database"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection from the pool
+
+        The transaction is committed when the block exits normally and rolled
+        back otherwise. The connection is always returned to the pool.
+
+        Yields:
+            obj: The pooled psycopg2 connection.
+
+        """
+        if self.pool is None:
+            raise Exception("The connection is not established")
+
+        if not self.__slots.acquire(timeout=self.__timeout):
+            raise Exception("No database connection available after {} seconds".format(self.__timeout))
+
+        try:
+            conn = self.pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except:
+                conn.rollback()
+                raise
+            finally:
+                self.pool.putconn(conn)
+        finally:
+            self.__slots.release()
+
 
+    def __prepare(self, cursor, name):
+        """Prepares the statement if it is not yet prepared on the connection of the cursor
 
-    def execute(self, statement):
+        The prepared statement outlives the transaction, so it is created
+        in the transaction of the checkout without an extra commit.
+
+        Args:
+            cursor (obj): The cursor of the pooled psycopg2 connection.
+            name (str): The name of the statement in PREPARED_STATEMENTS.
+        """
+        if name is None or name in cursor.connection.prepared:
+            return
+        cursor.execute(PREPARED_STATEMENTS[name])
+        cursor.connection.prepared.add(name)
+
+
+    def execute(self, statement, params=None, prepare=None):
         """Execute the provided statement
 
         Args:
             statement (str): The postgresql statement to be executed.
+            params (tuple): values to be formatted into the statement. (Default = None)
+            prepare (str): the prepared statement executed by the statement. (Default = None)
 
         Returns:
-            list: a list of tuples containing the postgresql records.
+            list: a list of dictionaries containing the postgresql records.
 
         """
-        if self.cursor is None:
-            raise Exception("The connection is not established")
-        else:
-            self.cursor.execute(statement)
-            num_fields = len(self.cursor.description)
-            field_names = [i[0] for i in self.cursor.description]
-            return [{ field_names[i]: row[i] for i in range(num_fields) } for row in self.cursor.fetchall()]
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                self.__prepare(cursor, prepare)
+                cursor.execute(statement, params)
+                if cursor.description is None:
+                    return None
+                return cursor.fetchall()
+
 
+    def execute_columnar(self, statement, params=None, prepare=None):
+        """Execute the provided statement and return the records column-wise
 
-    def get_documents_from_db(self, document_ids):
+        Args:
+            statement (str): The postgresql statement to be executed.
+            params (tuple): values to be formatted into the statement. (Default = None)
+            prepare (str): the prepared statement executed by the statement. (Default = None)
+
+        Returns:
+            dict: the column names mapped to the tuples of their values.
+
+        """
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                self.__prepare(cursor, prepare)
+                cursor.execute(statement, params)
+                if cursor.description is None:
+                    return None
+                field_names = [i[0] for i in cursor.description]
+                rows = cursor.fetchall()
+                columns = zip(*rows) if rows else [()] * len(field_names)
+                return dict(zip(field_names, columns))
+
+
+    def get_documents_from_db(self, document_ids, order_by_ids=False, after_id=None, limit=100, columnar=False):
         """
         Function receives a list of document ids and returns a list of dictionaries of documents data.
+        The `fulltext` field is not returned and `fulltext_cleaned` is sliced down to 500 chars.
 
         Parameters:
             documents_ids : list(int)
                 list of document ids
+            order_by_ids : boolean
+                return the documents in the order of `document_ids` instead of by id (Default False)
+            after_id : int
+                keyset cursor, return only documents with a greater id (Default None)
+            limit : int
+                the maximum number of returned documents (Default 100)
+            columnar : boolean
+                return a dictionary of the document fields mapped to their values (Default False)
 
         Returns:
-            success (boolean), list of dictionaries of document data if the extraction from the database was successful.
+            success (boolean), list of dictionaries of document data, or a dictionary of
+            columns if `columnar` is set, if the extraction from the database was successful.
         """
 
-        if self.cursor is None:
+        if self.pool is None:
             return False, {'Error' : 'The connection could not be established'}
 
-        statement = "SELECT * FROM documents WHERE document_id IN %s;"
+        params = {'ids': list(document_ids), 'after_id': after_id, 'order_by_ids': order_by_ids, 'limit': limit}
         try:
-            self.cursor.execute(statement, (tuple(document_ids),))
+            if columnar:
+                documents = self.execute_columnar(EXECUTE_DOCUMENTS, params, prepare='get_documents')
+            else:
+                documents = self.execute(EXECUTE_DOCUMENTS, params, prepare='get_documents')
         except:
             return False, {'Error' : 'You provided invalid document ids.'}
 
-        # Enumerating the fields
-        num_fields = len(self.cursor.description)
-        field_names = [i[0] for i in self.cursor.description]
-        documents = [{ field_names[i]: row[i] for i in range(num_fields) } for row in self.cursor.fetchall()]
-
-        # Cleaning the output:
-        # - removing fulltext field
-        # - slicing down the fulltext_cleaned field to 500 chars
-        # - we return only the first 10 results
-        for i in range(len(documents)):
-            if documents[i]['fulltext_cleaned'] is not None:
-                documents[i]['fulltext_cleaned'] = documents[i]['fulltext_cleaned'][:500]
-            documents[i].pop('fulltext')
-
-        return True, documents
\ No newline at end of file
+        return True, documents
@@ -44,7 +44,7 @@ if __name__=='__main__':
         app = create_app(args=arguments)
         # run the application
         if args.env == 'production':
-            serve(app, host=arguments["host"], port=arguments["port"])
+            serve(app, host=arguments["host"], port=arguments["port"], threads=app.config['SERVER_THREADS'])
         elif args.env == 'development':
             app.run(host=arguments["host"], port=arguments["port"], debug=True)
 
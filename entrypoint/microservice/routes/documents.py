@@ -7,15 +7,40 @@
 #   /documents/retrieve
 
 import sys
-import requests
 from flask import (
-    Blueprint, flash, g, redirect, request, session, url_for, jsonify, current_app as app
+    Blueprint, flash, g, redirect, request, session, url_for, current_app as app
 )
 from werkzeug.exceptions import abort
-from ..config import config_db
+from ..config import config_db, config_http
+from ..library.formatter import ojsonify
+from ..library.cache import get_cache
 
 bp = Blueprint('documents', __name__, url_prefix='/api/v1/documents')
 
+
+def _similarity_cache():
+    """Gets the short lived cache of the similarity service responses"""
+    return get_cache('similarity',
+        maxsize=app.config.get('SIMILARITY_CACHE_SIZE', 1024),
+        ttl=app.config.get('SIMILARITY_CACHE_TTL', 60)
+    )
+
+
+def _parse_document_ids(document_ids, limit=100):
+    """Parses the comma separated document ids
+
+    Args:
+        document_ids (str): The comma separated document ids.
+        limit (int): The maximum number of parsed ids. (Default = 100)
+
+    Returns:
+        list(int): the valid document ids.
+
+    """
+    # isdecimal (unlike isdigit) only accepts characters int() can parse
+    return [int(x) for x in document_ids.split(',')[:limit] if x.strip().isdecimal()]
+
+
 @bp.route('/', methods=['GET'])
 def get_documents():
     """
@@ -23,6 +48,9 @@ def get_documents():
 
     query parameters:
         * document_ids : Space separated set of document ids
+        * after_id : Return only the documents with a greater id (optional)
+        * format : Set to "columnar" to receive the documents as a dictionary of
+          fields mapped to the lists of their values (optional)
 
     The function returns a JSON response with the data of the documents. It is limited to
     output maximum of 100 documents.
@@ -32,23 +60,29 @@ def get_documents():
     """
 
     document_ids = request.args.get('document_ids', None)
+    after_id = request.args.get('after_id', default=None, type=int)
+    columnar = request.args.get('format', default=None) == 'columnar'
 
     # If the "document_ids" parameter was not set:
     if document_ids is None:
-        return jsonify(
+        return ojsonify(
             {'Message' : 'You need to provide query param "document_ids" : [comma separated set of documents ids]'}
         )
 
-    db = config_db.get_db()
     # We allows a maximum of 100 documents per query.
-    success, output = db.get_documents_from_db(document_ids.split(',')[:100])
+    ids = _parse_document_ids(document_ids)
+    if not ids:
+        return ojsonify({'Error' : 'You provided invalid document ids.'}), 400
+
+    db = config_db.get_db()
+    success, output = db.get_documents_from_db(ids, after_id=after_id, columnar=columnar)
     if success:
-        return jsonify({
+        return ojsonify({
             "documents" : output
         }), 200
     else:
         # Output is already a dictionary with an error message.
-        return jsonify(output), 400
+        return ojsonify(output), 400
 
 @bp.route('/<doc_id>', methods=['GET'])
 def retrieve_document(doc_id):
@@ -60,14 +94,17 @@ def retrieve_document(doc_id):
     Otherwise you will receive JSON dictionary with an `error` attribute, showing the error.
     """
 
+    if not doc_id.strip().isdecimal():
+        return ojsonify({'Error' : 'You provided invalid document ids.'}), 400
+
     db = config_db.get_db()
-    success, output = db.get_documents_from_db([doc_id])
+    success, output = db.get_documents_from_db([int(doc_id)])
     if success:
-        return jsonify({
+        return ojsonify({
             "documents" : output
         }), 200
     else:
-        return jsonify(output), 400
+        return ojsonify(output), 400
 
 @bp.route('/<doc_id>/similar', methods=['GET'])
 def get_similar_documents(doc_id):
@@ -102,8 +139,15 @@ def get_similar_documents(doc_id):
         'get_k' : request.args.get('get_k', 5)
     }
 
-    r = requests.get(f"http://{HOST}:{PORT}/api/v1/similarity/get_similarities", params=query_params)
-    json_response = r.json()
+    cache_key = (str(doc_id), str(query_params['get_k']))
+    json_response = _similarity_cache().get(cache_key)
+    if json_response is None:
+        r = config_http.get(f"http://{HOST}:{PORT}/api/v1/similarity/get_similarities",
+            params=query_params)
+        json_response = r.json()
+        if 'similar_documents' in json_response:
+            _similarity_cache().set(cache_key, json_response)
+
     if 'similar_documents' in json_response:
         # If request was successful, we get the documents from the db and and similarities to them.
         documents_ids = json_response.get('similar_documents', [])
@@ -111,24 +155,33 @@ def get_similar_documents(doc_id):
         similarities_dictionary = {doc_id : sim for doc_id, sim in similarities}
 
         db = config_db.get_db()
-        success, output = db.get_documents_from_db(documents_ids)
+        # keep the documents in the order of their similarity and return
+        # all of them, also when get_k exceeds the default limit
+        success, output = db.get_documents_from_db(documents_ids, order_by_ids=True,
+            limit=len(documents_ids))
         if success:
             for doc in output:
                 document_id = doc['document_id']
                 doc['similarity'] = similarities_dictionary[document_id]
-            return jsonify({
+            return ojsonify({
                 "documents" : output
                 }), 200
         else:
-            return jsonify(output), 400
+            return ojsonify(output), 400
     else:
-        return jsonify(json_response), 400
+        return ojsonify(json_response), 400
 
 @bp.route('/<doc_id>/similarity_update', methods=['POST'])
 def update_document_similarities(doc_id):
     """
     Make a request with POST method to this endpoint.
 
+    The similarity service embeds the document and stores its similarities to
+    all of the other documents, which takes longer than the other requests. It
+    waits up to HTTP_UPDATE_READ_TIMEOUT seconds for the update. If the update
+    takes longer, the response is 504 but the update keeps running in the
+    similarity service, so the request must not be repeated.
+
     Example request:
     {BASE_URL}/api/v1/documents/id/similarity_update
     """
@@ -138,8 +191,11 @@ def update_document_similarities(doc_id):
     query_params = {
         'document_id': doc_id,
     }
-    r = requests.get(f"http://{HOST}:{PORT}/api/v1/similarity/new_document_embedding", params=query_params)
-    return jsonify(r.json())
+    r = config_http.get(f"http://{HOST}:{PORT}/api/v1/similarity/new_document_embedding",
+        params=query_params, read_timeout=app.config.get('HTTP_UPDATE_READ_TIMEOUT', 300))
+    # the new document changes the similarities of the cached documents
+    _similarity_cache().clear()
+    return ojsonify(r.json())
 
 @bp.route('/search', methods=['GET'])
 def search_documents():
@@ -177,5 +233,6 @@ def search_documents():
         'limit': request.args.get('limit', default=None),
         'page': request.args.get('page', default=None)
     }
-    r = requests.get(f"http://{HOST}:{PORT}/api/v1/search", params=query_params)
-    return jsonify(r.json())
\ No newline at end of file
+    r = config_http.get(f"http://{HOST}:{PORT}/api/v1/search",
+        params=query_params)
+    return ojsonify(r.json())
\ No newline at end of file
@@ -43,6 +43,18 @@ def register(app):
             }
         })
 
+    @app.errorhandler(504)
+    def gateway_timeout(e):
+        # TODO: possible webpage for error
+        return jsonify({
+            "error": {
+                "message": "504: Gateway timeout",
+                "route": request.path,
+                "method": request.method,
+                "error": e.description,
+            }
+        }), 504
+
     @app.errorhandler(501)
     def method_not_implemented(e):
         # TODO: possible webpage for error
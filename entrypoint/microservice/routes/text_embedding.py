@@ -1,14 +1,21 @@
 # Routes related to english text embedding model
 
 import sys
-import requests
 from flask import (
     Blueprint, flash, g, redirect, request, session, url_for, jsonify, current_app as app
 )
 from werkzeug.exceptions import abort
+from ..config import config_http
+from ..library.cache import get_cache, text_key
 
 bp = Blueprint('embedding', __name__, url_prefix='/api/v1/embedding')
 
+
+def _embedding_cache():
+    """Gets the cache of the embeddings of the recently requested texts"""
+    return get_cache('embedding', maxsize=app.config.get('EMBEDDING_CACHE_SIZE', 4096))
+
+
 @bp.route('/', methods=['GET'])
 def index():
     # TODO: provide an appropriate output
@@ -53,5 +60,13 @@ def get_embedding():
         'text' : request.args.get('text', ""),
         "language" : request.args.get('language', None)
     }
-    r = requests.get(f"http://{HOST}:{PORT}/api/v1/embeddings/create", params=query_params)
-    return jsonify(r.json())
+    # the embedding of the same text is always the same
+    cache_key = text_key(query_params['text'], query_params['language'])
+    json_response = _embedding_cache().get(cache_key)
+    if json_response is None:
+        r = config_http.get(f"http://{HOST}:{PORT}/api/v1/embeddings/create",
+            params=query_params)
+        json_response = r.json()
+        if 'embedding' in json_response:
+            _embedding_cache().set(cache_key, json_response)
+    return jsonify(json_response)
@@ -5,10 +5,8 @@
 import os
 
 from flask import Flask
-from flask_cors import CORS
 
 from .config import config, config_logging
-from .library.supervisord import get_supervisord_proxy
 
 
 def create_app(args=None):
@@ -24,6 +22,7 @@ def create_app(args=None):
 
         if "supervisord" in args and args["supervisord"]:
             # get the supervisord proxy config
+            from .library.supervisord import get_supervisord_proxy
             proxy = get_supervisord_proxy()
 
         app.config.update(
@@ -45,6 +44,7 @@ def create_app(args=None):
 
     # setup the cors configurations
     if app.config['CORS']['origins']:
+        from flask_cors import CORS
         CORS(app, origins=app.config['CORS']['origins'])
 
     # add error handlers
@@ -4,15 +4,12 @@
 import os
 import sys
 import ast
-from requests import post
 
 from flask import (
     Blueprint, flash, g, request, jsonify, current_app as app, render_template, url_for
 )
 from werkzeug.exceptions import abort
 
-from langdetect import detect
-
 #################################################
 # Setup the proxy configuration
 #################################################
@@ -78,6 +75,10 @@ def embedding_create():
         return abort(405)
 
     try:
+        # imported on first use to keep the worker start up fast
+        from langdetect import detect
+        from requests import post
+
         # extract the text embedding
         text_language = language if language != None else detect(text)
         # check if we have a service that is able to handle the language